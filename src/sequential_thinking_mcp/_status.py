@@ -0,0 +1,26 @@
+"""
+Status lines shown under logged thoughts.
+
+Shared by both server implementations so their console output stays in step.
+"""
+
+from .models import ThoughtData
+
+STATUS_MORE = "[bright_green]→ More thoughts needed[/bright_green]"
+STATUS_DONE = "[bright_red]✓ Thinking complete[/bright_red]"
+STATUS_EXPAND = "[bright_yellow]📈 Expanding scope[/bright_yellow]"
+
+# Main thought status lines, indexed by (next_thought_needed << 1) | needs_more_thoughts
+_MAIN_STATUS_TABLE = (
+    STATUS_DONE,
+    f"{STATUS_DONE} {STATUS_EXPAND}",
+    STATUS_MORE,
+    f"{STATUS_MORE} {STATUS_EXPAND}",
+)
+
+
+def main_thought_status(thought_data: ThoughtData) -> str:
+    """Return the status markup for a main branch thought."""
+    return _MAIN_STATUS_TABLE[
+        (thought_data.next_thought_needed << 1) | bool(thought_data.needs_more_thoughts)
+    ]
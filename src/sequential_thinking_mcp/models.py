@@ -7,8 +7,18 @@ throughout the sequential thinking process.
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Union
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    field_serializer,
+    field_validator,
+    model_validator,
+)
+from typing_extensions import Self
 
 
 class ThoughtData(BaseModel):
@@ -80,53 +90,38 @@ class ThoughtData(BaseModel):
 
     model_config = {
         "populate_by_name": True,
-        "validate_assignment": True,
-        "extra": "forbid"
+        "extra": "forbid",
+        "frozen": True
     }
 
-    @field_validator("revises_thought")
-    @classmethod
-    def validate_revises_thought(cls, v: Optional[int], info) -> Optional[int]:
-        """Validate that revises_thought is consistent with is_revision."""
-        values = info.data
-        if v is not None and not values.get("is_revision"):
+    @model_validator(mode="after")
+    def _check(self) -> Self:
+        """Validate cross-field consistency of revision, branch and numbering data."""
+        if self.revises_thought is not None and not self.is_revision:
             raise ValueError("revises_thought can only be set when is_revision is True")
-        if values.get("is_revision") and v is None:
+        if self.is_revision and self.revises_thought is None:
             raise ValueError("revises_thought must be set when is_revision is True")
-        return v
-
-    @field_validator("branch_id")
-    @classmethod
-    def validate_branch_id(cls, v: Optional[str], info) -> Optional[str]:
-        """Validate that branch_id is provided when branching."""
-        values = info.data
-        if v is not None and values.get("branch_from_thought") is None:
+        if self.branch_id is not None and self.branch_from_thought is None:
             raise ValueError("branch_id requires branch_from_thought to be set")
-        return v
-
-    @field_validator("total_thoughts")
-    @classmethod
-    def validate_total_thoughts(cls, v: int, info) -> int:
-        """Validate that total_thoughts is at least as large as thought_number."""
-        values = info.data
-        thought_number = values.get("thought_number")
-        if thought_number is not None and v < thought_number:
+        if self.total_thoughts < self.thought_number:
             raise ValueError("total_thoughts must be at least as large as thought_number")
-        return v
+        return self
+
+    @cached_property
+    def preview(self) -> str:
+        """First 50 characters of the thought, computed once for summary views."""
+        return self.thought[:50]
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> Self:
+        """Copy the thought, dropping the cached preview if fields are updated."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied.__dict__.pop("preview", None)
+        return copied
 
     def to_display_dict(self) -> Dict:
         """Convert to dictionary for display purposes, using original field names."""
-        return {
-            "thought": self.thought,
-            "thoughtNumber": self.thought_number,
-            "totalThoughts": self.total_thoughts,
-            "nextThoughtNeeded": self.next_thought_needed,
-            "isRevision": self.is_revision,
-            "revisesThought": self.revises_thought,
-            "branchFromThought": self.branch_from_thought,
-            "branchId": self.branch_id,
-            "needsMoreThoughts": self.needs_more_thoughts,
-        }
+        return self.model_dump(by_alias=True)
 
 
 class ThoughtSummary(BaseModel):
@@ -137,6 +132,9 @@ class ThoughtSummary(BaseModel):
     and the overall progress of the sequential thinking session.
     """
     
+    # Summaries are cached and shared between reads, so they must not change
+    model_config = {"frozen": True}
+    
     total_thoughts: int = Field(
         ...,
         description="Total number of thoughts recorded"
@@ -220,43 +218,101 @@ class ThinkingSession(BaseModel):
         description="Dictionary mapping branch IDs to their thoughts"
     )
     
-    created_at: Optional[str] = Field(
+    created_at: Optional[float] = Field(
         None,
-        description="ISO timestamp when session was created"
+        description="Unix timestamp when session was created, serialized as ISO"
     )
     
-    updated_at: Optional[str] = Field(
+    updated_at: Optional[float] = Field(
         None,
-        description="ISO timestamp when session was last updated"
+        description="Unix timestamp when session was last updated, serialized as ISO"
     )
     
-    def get_summary(self) -> ThoughtSummary:
-        """Generate a summary of this thinking session."""
-        total_thoughts = len(self.main_thoughts)
-        for branch_thoughts in self.branches.values():
-            total_thoughts += len(branch_thoughts)
+    _revisions_count: int = PrivateAttr(default=0)
+    _total_branch_thoughts: int = PrivateAttr(default=0)
+    _summary_cache: Optional[ThoughtSummary] = PrivateAttr(default=None)
+    _dirty: bool = PrivateAttr(default=True)
+    _version: int = PrivateAttr(default=0)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Seed the running counters from any thoughts supplied at construction."""
+        for thoughts in (self.main_thoughts, *self.branches.values()):
+            self._revisions_count += sum(1 for thought in thoughts if thought.is_revision)
+        self._total_branch_thoughts = sum(len(thoughts) for thoughts in self.branches.values())
+    
+    @field_validator("created_at", "updated_at", mode="before")
+    @classmethod
+    def _parse_timestamp(cls, value: Any) -> Any:
+        """Accept ISO strings, as produced by serialization, alongside epoch floats."""
+        if isinstance(value, str):
+            return datetime.fromisoformat(value).timestamp()
+        return value
+    
+    @field_serializer("created_at", "updated_at")
+    def _serialize_timestamp(self, value: Union[float, str, None]) -> Optional[str]:
+        """
+        Format epoch timestamps as ISO strings only when serializing.
         
-        revisions_count = sum(
-            1 for thought in self.main_thoughts if thought.is_revision
-        )
-        for branch_thoughts in self.branches.values():
-            revisions_count += sum(
-                1 for thought in branch_thoughts if thought.is_revision
-            )
+        Assignments are not validated, so an ISO string assigned directly is
+        passed through unchanged.
+        """
+        if value is None or isinstance(value, str):
+            return value
+        return datetime.fromtimestamp(value).isoformat()
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped on every recorded thought, for keying derived caches."""
+        return self._version
+    
+    def add_thought(self, thought: ThoughtData, branch_id: Optional[str] = None) -> None:
+        """Append a thought to the main sequence, or to ``branch_id`` if given."""
+        if branch_id is None:
+            self.main_thoughts.append(thought)
+        else:
+            self.branches.setdefault(branch_id, []).append(thought)
+            self._total_branch_thoughts += 1
         
-        is_complete = bool(
-            self.main_thoughts and not self.main_thoughts[-1].next_thought_needed
+        if thought.is_revision:
+            self._revisions_count += 1
+        self._dirty = True
+        self._version += 1
+    
+    def revise_thought(self, index: int, thought: ThoughtData) -> None:
+        """Replace the main thought at ``index`` and drop every thought after it."""
+        removed = self.main_thoughts[index:]
+        self.main_thoughts[index] = thought
+        del self.main_thoughts[index + 1:]
+        
+        self._revisions_count += (1 if thought.is_revision else 0) - sum(
+            1 for old in removed if old.is_revision
         )
+        self._dirty = True
+        self._version += 1
+    
+    def get_summary(self) -> ThoughtSummary:
+        """
+        Return a summary of this thinking session.
+        
+        The revision and branch thought counts are running counters kept by
+        ``add_thought`` and ``revise_thought``, and the summary object is
+        reused until the next change, so thoughts must be recorded through
+        those methods rather than by editing ``main_thoughts``/``branches``
+        directly.
+        """
+        if not self._dirty and self._summary_cache is not None:
+            return self._summary_cache
         
-        last_thought = None
-        if self.main_thoughts:
-            last_thought = self.main_thoughts[-1]
+        main_thoughts = self.main_thoughts
+        last_thought = main_thoughts[-1] if main_thoughts else None
         
-        return ThoughtSummary(
-            total_thoughts=total_thoughts,
-            main_branch_thoughts=len(self.main_thoughts),
+        self._summary_cache = ThoughtSummary(
+            total_thoughts=len(main_thoughts) + self._total_branch_thoughts,
+            main_branch_thoughts=len(main_thoughts),
             branches=list(self.branches.keys()),
-            revisions_count=revisions_count,
-            is_complete=is_complete,
+            revisions_count=self._revisions_count,
+            is_complete=last_thought is not None and not last_thought.next_thought_needed,
             last_thought=last_thought
         )
+        self._dirty = False
+        return self._summary_cache
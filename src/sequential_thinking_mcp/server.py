@@ -10,31 +10,119 @@ supporting revisions, and enabling multiple solution paths through the Model Con
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import sys
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Sequence
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 from mcp.server.lowlevel import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
 from mcp.types import (
     CallToolResult,
-    ListToolsResult,
-    ListResourcesResult,
-    ReadResourceResult,
     Resource,
     TextContent,
     Tool,
 )
-from pydantic import ValidationError
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.tree import Tree
+import orjson
+from pydantic import TypeAdapter, ValidationError
 
-from .models import ThoughtData, ThoughtSummary, BranchInfo, ThinkingSession
+try:
+    import msgpack
+except ImportError:  # Optional: install the "msgpack" extra for binary resources
+    msgpack = None
+
+from ._status import main_thought_status
+from .models import ThoughtData, ThinkingSession
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.tree import Tree
+
+_THOUGHT_LIST_ADAPTER = TypeAdapter(List[ThoughtData])
+
+_THINK_INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "thought": {
+            "type": "string",
+            "description": "Your current thinking step"
+        },
+        "nextThoughtNeeded": {
+            "type": "boolean",
+            "description": "Whether another thought step is needed"
+        },
+        "thoughtNumber": {
+            "type": "integer",
+            "description": "Current thought number",
+            "minimum": 1
+        },
+        "totalThoughts": {
+            "type": "integer",
+            "description": "Estimated total thoughts needed",
+            "minimum": 1
+        },
+        "isRevision": {
+            "type": "boolean",
+            "description": "Whether this revises previous thinking"
+        },
+        "revisesThought": {
+            "type": "integer",
+            "description": "Which thought is being reconsidered",
+            "minimum": 1
+        },
+        "branchFromThought": {
+            "type": "integer",
+            "description": "Branching point thought number",
+            "minimum": 1
+        },
+        "branchId": {
+            "type": "string",
+            "description": "Branch identifier"
+        },
+        "needsMoreThoughts": {
+            "type": "boolean",
+            "description": "If more thoughts are needed"
+        }
+    },
+    "required": [
+        "thought",
+        "nextThoughtNeeded", 
+        "thoughtNumber",
+        "totalThoughts"
+    ]
+}
+
+_THINK_TOOL = Tool(
+    name="think",
+    description=(
+        "Process a sequential thinking step with support for "
+        "revisions and branching. This tool facilitates a detailed, "
+        "step-by-step thinking process for problem-solving and analysis. "
+        "Only set next_thought_needed to false when truly done and "
+        "a satisfactory answer is reached."
+    ),
+    inputSchema=_THINK_INPUT_SCHEMA
+)
+
+_TOOLS = [_THINK_TOOL]
+
+def _dump(obj: Any, pretty: bool = False) -> str:
+    """Serialize an object to a JSON string using orjson, indented if ``pretty``."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+
+
+def _text_resource(text: str) -> List[ReadResourceContents]:
+    """Wrap a JSON payload as the single content of a resource read."""
+    return [ReadResourceContents(content=text, mime_type="application/json")]
+
+
+def _msgpack_resource(payload: Any) -> List[ReadResourceContents]:
+    """Encode a payload as msgpack; the SDK base64-encodes it into a blob."""
+    packed = msgpack.packb(payload, use_bin_type=True)
+    return [ReadResourceContents(content=packed, mime_type="application/msgpack")]
 
 
 class SequentialThinkingServer:
@@ -48,18 +136,78 @@ class SequentialThinkingServer:
     
     def __init__(self) -> None:
         """Initialize the Sequential Thinking server."""
-        self.console = Console(stderr=True, force_terminal=True)
         self.disable_thought_logging = (
             os.getenv("DISABLE_THOUGHT_LOGGING", "").lower() == "true"
         )
+        self.pretty_json = os.getenv("MCP_PRETTY_JSON", "").lower() == "true"
+        
+        # Serialized thoughts://history keyed by session version
+        self._history_cache: Optional[Tuple[int, str]] = None
+        
+        # Serialized thoughts://session keyed by (session version, updated_at)
+        self._session_json_cache: Optional[Tuple[Tuple[int, Optional[float]], str]] = None
+        
+        # Rendered session summary tree keyed by session version
+        self._tree_cache: Optional[Tuple[int, Tree]] = None
         
         # Initialize thinking session
+        now = time.time()
         self.session = ThinkingSession(
             session_id=str(uuid.uuid4()),
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat()
+            created_at=now,
+            updated_at=now
         )
         
+        # Resource listings are static, so build them once
+        self._resources = [
+            Resource(
+                uri="thoughts://history",
+                name="Thought History",
+                description="Complete history of all thoughts in the main branch"
+            ),
+            Resource(
+                uri="thoughts://summary",
+                name="Thinking Summary",
+                description="Summary of the entire thinking process"
+            ),
+            Resource(
+                uri="thoughts://branches",
+                name="Branch Overview",
+                description="Overview of all branches in the thinking process"
+            ),
+            Resource(
+                uri="thoughts://session",
+                name="Complete Session",
+                description="Complete thinking session with all thoughts and branches"
+            )
+        ]
+        if msgpack is not None:
+            self._resources += [
+                Resource(
+                    uri="thoughts://history.msgpack",
+                    name="Thought History (msgpack)",
+                    description="Main branch thought history encoded as msgpack",
+                    mimeType="application/msgpack"
+                ),
+                Resource(
+                    uri="thoughts://session.msgpack",
+                    name="Complete Session (msgpack)",
+                    description="Complete thinking session encoded as msgpack",
+                    mimeType="application/msgpack"
+                )
+            ]
+        
+        # Fixed resource URIs mapped to their read handlers
+        self._resource_handlers: Dict[str, Callable[[], List[ReadResourceContents]]] = {
+            "thoughts://history": self._res_history,
+            "thoughts://summary": self._res_summary,
+            "thoughts://branches": self._res_branches,
+            "thoughts://session": self._res_session,
+        }
+        if msgpack is not None:
+            self._resource_handlers["thoughts://history.msgpack"] = self._res_history_msgpack
+            self._resource_handlers["thoughts://session.msgpack"] = self._res_session_msgpack
+        
         # Create the MCP server
         self.server = Server("sequential-thinking-mcp")
         self._setup_handlers()
@@ -67,172 +215,36 @@ class SequentialThinkingServer:
         if not self.disable_thought_logging:
             self._log_startup()
     
+    @cached_property
+    def console(self) -> Console:
+        """Rich console for stderr logging, created on first use."""
+        from rich.console import Console
+        
+        return Console(stderr=True, force_terminal=True)
+    
     def _setup_handlers(self) -> None:
         """Set up the MCP request handlers."""
         
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List available tools."""
-            return [
-                Tool(
-                    name="think",
-                    description=(
-                        "Process a sequential thinking step with support for "
-                        "revisions and branching. This tool facilitates a detailed, "
-                        "step-by-step thinking process for problem-solving and analysis. "
-                        "Only set next_thought_needed to false when truly done and "
-                        "a satisfactory answer is reached."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "thought": {
-                                "type": "string",
-                                "description": "Your current thinking step"
-                            },
-                            "nextThoughtNeeded": {
-                                "type": "boolean",
-                                "description": "Whether another thought step is needed"
-                            },
-                            "thoughtNumber": {
-                                "type": "integer",
-                                "description": "Current thought number",
-                                "minimum": 1
-                            },
-                            "totalThoughts": {
-                                "type": "integer",
-                                "description": "Estimated total thoughts needed",
-                                "minimum": 1
-                            },
-                            "isRevision": {
-                                "type": "boolean",
-                                "description": "Whether this revises previous thinking"
-                            },
-                            "revisesThought": {
-                                "type": "integer",
-                                "description": "Which thought is being reconsidered",
-                                "minimum": 1
-                            },
-                            "branchFromThought": {
-                                "type": "integer",
-                                "description": "Branching point thought number",
-                                "minimum": 1
-                            },
-                            "branchId": {
-                                "type": "string",
-                                "description": "Branch identifier"
-                            },
-                            "needsMoreThoughts": {
-                                "type": "boolean",
-                                "description": "If more thoughts are needed"
-                            }
-                        },
-                        "required": [
-                            "thought",
-                            "nextThoughtNeeded", 
-                            "thoughtNumber",
-                            "totalThoughts"
-                        ]
-                    }
-                )
-            ]
+            return _TOOLS
         
         @self.server.list_resources()
         async def list_resources() -> list[Resource]:
             """List available resources."""
-            return [
-                Resource(
-                    uri="thoughts://history",
-                    name="Thought History",
-                    description="Complete history of all thoughts in the main branch"
-                ),
-                Resource(
-                    uri="thoughts://summary",
-                    name="Thinking Summary",
-                    description="Summary of the entire thinking process"
-                ),
-                Resource(
-                    uri="thoughts://branches",
-                    name="Branch Overview",
-                    description="Overview of all branches in the thinking process"
-                ),
-                Resource(
-                    uri="thoughts://session",
-                    name="Complete Session",
-                    description="Complete thinking session with all thoughts and branches"
-                )
-            ]
+            return self._resources
         
         @self.server.read_resource()
-        async def read_resource(uri: str) -> ReadResourceResult:
+        async def read_resource(uri: str) -> List[ReadResourceContents]:
             """Read a specific resource."""
-            if uri == "thoughts://history":
-                return ReadResourceResult(
-                    contents=[
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                [thought.to_display_dict() for thought in self.session.main_thoughts],
-                                indent=2
-                            )
-                        )
-                    ]
-                )
-            elif uri == "thoughts://summary":
-                summary = self.session.get_summary()
-                return ReadResourceResult(
-                    contents=[
-                        TextContent(
-                            type="text", 
-                            text=json.dumps(summary.model_dump(), indent=2)
-                        )
-                    ]
-                )
-            elif uri == "thoughts://branches":
-                branches_info = []
-                for branch_id, thoughts in self.session.branches.items():
-                    branch_info = BranchInfo(
-                        branch_id=branch_id,
-                        branch_from_thought=thoughts[0].branch_from_thought or 0,
-                        thoughts=thoughts
-                    )
-                    branches_info.append(branch_info.model_dump())
-                
-                return ReadResourceResult(
-                    contents=[
-                        TextContent(
-                            type="text",
-                            text=json.dumps(branches_info, indent=2)
-                        )
-                    ]
-                )
-            elif uri == "thoughts://session":
-                return ReadResourceResult(
-                    contents=[
-                        TextContent(
-                            type="text",
-                            text=json.dumps(self.session.model_dump(), indent=2)
-                        )
-                    ]
-                )
-            elif uri.startswith("thoughts://branches/"):
-                branch_id = uri.split("/")[-1]
-                if branch_id in self.session.branches:
-                    return ReadResourceResult(
-                        contents=[
-                            TextContent(
-                                type="text",
-                                text=json.dumps(
-                                    [thought.to_display_dict() for thought in self.session.branches[branch_id]],
-                                    indent=2
-                                )
-                            )
-                        ]
-                    )
-                else:
-                    raise ValueError(f"Branch '{branch_id}' not found")
-            else:
-                raise ValueError(f"Unknown resource: {uri}")
+            uri = str(uri)
+            handler = self._resource_handlers.get(uri)
+            if handler is not None:
+                return handler()
+            if uri.startswith("thoughts://branches/"):
+                return self._res_branch(uri.split("/")[-1])
+            raise ValueError(f"Unknown resource: {uri}")
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
@@ -248,7 +260,7 @@ class SequentialThinkingServer:
                 await self._process_thought(thought_data)
                 
                 # Update session timestamp
-                self.session.updated_at = datetime.now().isoformat()
+                self.session.updated_at = time.time()
                 
                 # Return success response
                 return CallToolResult(
@@ -287,16 +299,72 @@ class SequentialThinkingServer:
                     isError=True
                 )
     
+    def _res_history(self) -> List[ReadResourceContents]:
+        """Read the main branch thought history."""
+        if self._history_cache is None or self._history_cache[0] != self.session.version:
+            self._history_cache = (
+                self.session.version,
+                _THOUGHT_LIST_ADAPTER.dump_json(
+                    self.session.main_thoughts, by_alias=True, indent=2 if self.pretty_json else None
+                ).decode()
+            )
+        return _text_resource(self._history_cache[1])
+    
+    def _res_summary(self) -> List[ReadResourceContents]:
+        """Read the summary of the thinking process."""
+        summary = self.session.get_summary()
+        return _text_resource(_dump(summary.model_dump(), self.pretty_json))
+    
+    def _res_branches(self) -> List[ReadResourceContents]:
+        """Read the overview of all branches."""
+        branches_info = [
+            {
+                "branch_id": branch_id,
+                "branch_from_thought": thoughts[0].branch_from_thought or 0,
+                "thoughts": _THOUGHT_LIST_ADAPTER.dump_python(thoughts),
+            }
+            for branch_id, thoughts in self.session.branches.items()
+        ]
+        
+        return _text_resource(_dump(branches_info, self.pretty_json))
+    
+    def _res_session(self) -> List[ReadResourceContents]:
+        """Read the complete thinking session."""
+        key = (self.session.version, self.session.updated_at)
+        if self._session_json_cache is None or self._session_json_cache[0] != key:
+            self._session_json_cache = (
+                key,
+                _dump(self.session.model_dump(), self.pretty_json)
+            )
+        return _text_resource(self._session_json_cache[1])
+    
+    def _res_history_msgpack(self) -> List[ReadResourceContents]:
+        """Read the main branch thought history as msgpack."""
+        return _msgpack_resource(
+            _THOUGHT_LIST_ADAPTER.dump_python(self.session.main_thoughts, by_alias=True)
+        )
+    
+    def _res_session_msgpack(self) -> List[ReadResourceContents]:
+        """Read the complete thinking session as msgpack."""
+        return _msgpack_resource(self.session.model_dump())
+    
+    def _res_branch(self, branch_id: str) -> List[ReadResourceContents]:
+        """Read the thoughts of a single branch."""
+        if branch_id not in self.session.branches:
+            raise ValueError(f"Branch '{branch_id}' not found")
+        return _text_resource(
+            _THOUGHT_LIST_ADAPTER.dump_json(
+                self.session.branches[branch_id], by_alias=True, indent=2 if self.pretty_json else None
+            ).decode()
+        )
+    
     async def _process_thought(self, thought_data: ThoughtData) -> None:
         """Process a single thought and update the session state."""
         
         # Determine if this is a branch or main thought
         if thought_data.branch_id and thought_data.branch_from_thought:
             # This is a branch thought
-            if thought_data.branch_id not in self.session.branches:
-                self.session.branches[thought_data.branch_id] = []
-            
-            self.session.branches[thought_data.branch_id].append(thought_data)
+            self.session.add_thought(thought_data, branch_id=thought_data.branch_id)
             
             if not self.disable_thought_logging:
                 self._log_branch_thought(thought_data)
@@ -307,7 +375,7 @@ class SequentialThinkingServer:
                 self._handle_revision(thought_data)
             else:
                 # Regular thought
-                self.session.main_thoughts.append(thought_data)
+                self.session.add_thought(thought_data)
             
             if not self.disable_thought_logging:
                 self._log_main_thought(thought_data)
@@ -315,18 +383,18 @@ class SequentialThinkingServer:
     def _handle_revision(self, thought_data: ThoughtData) -> None:
         """Handle a revision of a previous thought."""
         if thought_data.revises_thought and thought_data.revises_thought <= len(self.session.main_thoughts):
-            # Replace the thought being revised
-            revision_index = thought_data.revises_thought - 1
-            self.session.main_thoughts[revision_index] = thought_data
-            
-            # Remove any subsequent thoughts that are now invalidated
-            self.session.main_thoughts = self.session.main_thoughts[:revision_index + 1]
+            # Replace the thought being revised and remove any subsequent
+            # thoughts that are now invalidated
+            self.session.revise_thought(thought_data.revises_thought - 1, thought_data)
         else:
             # If revision target is invalid, treat as regular thought
-            self.session.main_thoughts.append(thought_data)
+            self.session.add_thought(thought_data)
     
     def _log_startup(self) -> None:
         """Log server startup message."""
+        from rich.panel import Panel
+        from rich.text import Text
+        
         startup_panel = Panel.fit(
             Text("Sequential Thinking MCP Server Started", style="bold green"),
             border_style="bright_blue"
@@ -339,6 +407,8 @@ class SequentialThinkingServer:
     
     def _log_main_thought(self, thought_data: ThoughtData) -> None:
         """Log a main branch thought with rich formatting."""
+        from rich.panel import Panel
+        from rich.text import Text
         
         # Create thought header
         if thought_data.is_revision:
@@ -359,22 +429,14 @@ class SequentialThinkingServer:
         self.console.print(thought_panel)
         
         # Add status indicators
-        status_parts = []
-        if thought_data.next_thought_needed:
-            status_parts.append("[bright_green]→ More thoughts needed[/bright_green]")
-        else:
-            status_parts.append("[bright_red]✓ Thinking complete[/bright_red]")
-        
-        if thought_data.needs_more_thoughts:
-            status_parts.append("[bright_yellow]📈 Expanding scope[/bright_yellow]")
-        
-        if status_parts:
-            self.console.print(" ".join(status_parts))
+        self.console.print(main_thought_status(thought_data))
         
         self.console.print()
     
     def _log_branch_thought(self, thought_data: ThoughtData) -> None:
         """Log a branch thought with rich formatting."""
+        from rich.panel import Panel
+        from rich.text import Text
         
         header = f"🌿 Branch: {thought_data.branch_id} ({thought_data.thought_number}/{thought_data.total_thoughts})"
         
@@ -402,6 +464,9 @@ class SequentialThinkingServer:
     
     def _log_error(self, error_msg: str) -> None:
         """Log an error message with rich formatting."""
+        from rich.panel import Panel
+        from rich.text import Text
+        
         error_panel = Panel(
             Text(error_msg, style="bold red"),
             title="Error",
@@ -416,6 +481,16 @@ class SequentialThinkingServer:
         if self.disable_thought_logging:
             return
         
+        if self._tree_cache is None or self._tree_cache[0] != self.session.version:
+            self._tree_cache = (self.session.version, self._build_session_tree())
+        
+        self.console.print(self._tree_cache[1])
+        self.console.print()
+    
+    def _build_session_tree(self) -> Tree:
+        """Build a tree view of the current session."""
+        from rich.tree import Tree
+        
         summary = self.session.get_summary()
         
         # Create a tree view of the session
@@ -426,7 +501,7 @@ class SequentialThinkingServer:
         for i, thought in enumerate(self.session.main_thoughts, 1):
             status = "✅" if not thought.next_thought_needed else "⏳"
             revision = " 🔄" if thought.is_revision else ""
-            main_branch.add(f"{status} Thought {i}: {thought.thought[:50]}...{revision}")
+            main_branch.add(f"{status} Thought {i}: {thought.preview}...{revision}")
         
         # Branches
         if summary.branches:
@@ -436,7 +511,7 @@ class SequentialThinkingServer:
                 branch_node = branches_node.add(f"🌿 {branch_id} ({len(branch_thoughts)} thoughts)")
                 for i, thought in enumerate(branch_thoughts, 1):
                     status = "✅" if not thought.next_thought_needed else "⏳"
-                    branch_node.add(f"{status} Thought {i}: {thought.thought[:50]}...")
+                    branch_node.add(f"{status} Thought {i}: {thought.preview}...")
         
         # Summary stats
         stats_node = tree.add("📊 Statistics")
@@ -444,8 +519,7 @@ class SequentialThinkingServer:
         stats_node.add(f"Revisions: {summary.revisions_count}")
         stats_node.add(f"Status: {'Complete' if summary.is_complete else 'In Progress'}")
         
-        self.console.print(tree)
-        self.console.print()
+        return tree
     
     async def run(self) -> None:
         """Run the server using stdio transport."""
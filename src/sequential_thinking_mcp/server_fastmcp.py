@@ -11,20 +11,36 @@ Uses FastMCP for simplified server management and automatic asyncio handling.
 
 from __future__ import annotations
 
-import json
 import os
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Optional
 
+import orjson
 from mcp.server.fastmcp import FastMCP
-from pydantic import ValidationError
-from rich.console import Console
+from pydantic import TypeAdapter, ValidationError
+from rich.console import Console, Group
 from rich.panel import Panel
+from rich.style import Style
 from rich.text import Text
-from rich.tree import Tree
 
-from .models import ThoughtData, ThoughtSummary, BranchInfo, ThinkingSession
+from ._status import main_thought_status
+from .models import ThoughtData, ThinkingSession
+
+
+# Panel styling shared by every log call
+_MAIN_BORDER = "bright_blue"
+_REVISION_BORDER = "yellow"
+_BRANCH_BORDER = "bright_magenta"
+_WHITE = Style(color="white")
+
+# Status lines shown under thought panels
+_BRANCH_STATUS_MORE = "[bright_green]→ More thoughts needed in this branch[/bright_green]"
+_BRANCH_STATUS_DONE = "[bright_red]✓ Branch complete[/bright_red]"
+
+# Built once so each think() call reuses the compiled ThoughtData validator
+_THOUGHT_ADAPTER = TypeAdapter(ThoughtData)
 
 
 # Initialize FastMCP server
@@ -35,10 +51,11 @@ console = Console(stderr=True, force_terminal=True)
 disable_thought_logging = os.getenv("DISABLE_THOUGHT_LOGGING", "").lower() == "true"
 
 # Initialize thinking session
+_now = time.time()
 session = ThinkingSession(
     session_id=str(uuid.uuid4()),
-    created_at=datetime.now().isoformat(),
-    updated_at=datetime.now().isoformat()
+    created_at=_now,
+    updated_at=_now
 )
 
 
@@ -49,7 +66,7 @@ def _log_startup() -> None:
         
     startup_panel = Panel.fit(
         Text("Sequential Thinking MCP Server Started", style="bold green"),
-        border_style="bright_blue"
+        border_style=_MAIN_BORDER
     )
     console.print(startup_panel)
     console.print(f"[dim]Session ID: {session.session_id}[/dim]")
@@ -61,38 +78,28 @@ def _log_main_thought(thought_data: ThoughtData) -> None:
     if disable_thought_logging:
         return
     
+    number = thought_data.thought_number
+    total = thought_data.total_thoughts
+    
     # Create thought header
     if thought_data.is_revision:
-        header = f"🔄 Revision {thought_data.thought_number}/{thought_data.total_thoughts}"
-        color = "yellow"
+        header = f"🔄 Revision {number}/{total}"
+        color = _REVISION_BORDER
     else:
-        header = f"💭 Thought {thought_data.thought_number}/{thought_data.total_thoughts}"
-        color = "bright_blue"
+        header = f"💭 Thought {number}/{total}"
+        color = _MAIN_BORDER
     
     # Create the thought panel
     thought_panel = Panel(
-        Text(thought_data.thought, style="white"),
+        Text(thought_data.thought, style=_WHITE),
         title=header,
         border_style=color,
         width=80
     )
     
-    console.print(thought_panel)
-    
-    # Add status indicators
-    status_parts = []
-    if thought_data.next_thought_needed:
-        status_parts.append("[bright_green]→ More thoughts needed[/bright_green]")
-    else:
-        status_parts.append("[bright_red]✓ Thinking complete[/bright_red]")
-    
-    if thought_data.needs_more_thoughts:
-        status_parts.append("[bright_yellow]📈 Expanding scope[/bright_yellow]")
-    
-    if status_parts:
-        console.print(" ".join(status_parts))
-    
-    console.print()
+    # Render panel, status and spacing in a single write
+    status = main_thought_status(thought_data)
+    console.print(Group(thought_panel, console.render_str(status), Text()))
 
 
 def _log_branch_thought(thought_data: ThoughtData) -> None:
@@ -100,29 +107,32 @@ def _log_branch_thought(thought_data: ThoughtData) -> None:
     if disable_thought_logging:
         return
     
-    header = f"🌿 Branch: {thought_data.branch_id} ({thought_data.thought_number}/{thought_data.total_thoughts})"
+    branch_id = thought_data.branch_id
+    number = thought_data.thought_number
+    total = thought_data.total_thoughts
+    header = f"🌿 Branch: {branch_id} ({number}/{total})"
     
     # Create the branch panel
     branch_panel = Panel(
-        Text(thought_data.thought, style="white"),
+        Text(thought_data.thought, style=_WHITE),
         title=header,
-        border_style="bright_magenta",
+        border_style=_BRANCH_BORDER,
         width=80
     )
     
-    console.print(branch_panel)
-    
     # Add branch info
     branch_info = f"[dim]Branched from thought {thought_data.branch_from_thought}[/dim]"
-    console.print(branch_info)
     
     # Add status indicators
     if thought_data.next_thought_needed:
-        console.print("[bright_green]→ More thoughts needed in this branch[/bright_green]")
+        status = _BRANCH_STATUS_MORE
     else:
-        console.print("[bright_red]✓ Branch complete[/bright_red]")
+        status = _BRANCH_STATUS_DONE
     
-    console.print()
+    # Render panel, branch info, status and spacing in a single write
+    console.print(
+        Group(branch_panel, console.render_str(branch_info), console.render_str(status), Text())
+    )
 
 
 def _log_error(error_msg: str) -> None:
@@ -142,28 +152,25 @@ def _log_error(error_msg: str) -> None:
 
 def _handle_revision(thought_data: ThoughtData) -> None:
     """Handle a revision of a previous thought."""
-    if thought_data.revises_thought and thought_data.revises_thought <= len(session.main_thoughts):
-        # Replace the thought being revised
-        revision_index = thought_data.revises_thought - 1
-        session.main_thoughts[revision_index] = thought_data
-        
-        # Remove any subsequent thoughts that are now invalidated
-        session.main_thoughts = session.main_thoughts[:revision_index + 1]
+    target = thought_data.revises_thought
+    if target and target <= len(session.main_thoughts):
+        # Replace the thought being revised and remove any subsequent
+        # thoughts that are now invalidated
+        session.revise_thought(target - 1, thought_data)
     else:
         # If revision target is invalid, treat as regular thought
-        session.main_thoughts.append(thought_data)
+        session.add_thought(thought_data)
 
 
 def _process_thought(thought_data: ThoughtData) -> None:
     """Process a single thought and update the session state."""
     
+    branch_id = thought_data.branch_id
+    
     # Determine if this is a branch or main thought
-    if thought_data.branch_id and thought_data.branch_from_thought:
+    if branch_id and thought_data.branch_from_thought:
         # This is a branch thought
-        if thought_data.branch_id not in session.branches:
-            session.branches[thought_data.branch_id] = []
-        
-        session.branches[thought_data.branch_id].append(thought_data)
+        session.add_thought(thought_data, branch_id=branch_id)
         _log_branch_thought(thought_data)
     else:
         # This is a main branch thought
@@ -172,13 +179,13 @@ def _process_thought(thought_data: ThoughtData) -> None:
             _handle_revision(thought_data)
         else:
             # Regular thought
-            session.main_thoughts.append(thought_data)
+            session.add_thought(thought_data)
         
         _log_main_thought(thought_data)
 
 
 @mcp.tool()
-def think(
+async def think(
     thought: str,
     nextThoughtNeeded: bool,
     thoughtNumber: int,
@@ -209,26 +216,37 @@ def think(
     Returns:
         Success or error message
     """
+    # Reject the common malformed inputs before running the full validator
+    error_msg = None
+    if thoughtNumber < 1 or totalThoughts < thoughtNumber:
+        error_msg = "Invalid thought data: thoughtNumber must be between 1 and totalThoughts"
+    elif isRevision and revisesThought is None:
+        error_msg = "Invalid thought data: revisesThought must be set when isRevision is True"
+    elif branchId is not None and branchFromThought is None:
+        error_msg = "Invalid thought data: branchId requires branchFromThought to be set"
+    if error_msg is not None:
+        _log_error(error_msg)
+        return f"❌ {error_msg}"
+
     try:
-        # Create thought data with proper mapping
-        thought_data = ThoughtData(
-            thought=thought,
-            next_thought_needed=nextThoughtNeeded,
-            thought_number=thoughtNumber,
-            total_thoughts=totalThoughts,
-            is_revision=isRevision,
-            revises_thought=revisesThought,
-            branch_from_thought=branchFromThought,
-            branch_id=branchId,
-            needs_more_thoughts=needsMoreThoughts
-        )
+        # Validate the tool arguments, keyed by their camelCase aliases
+        thought_data = _THOUGHT_ADAPTER.validate_python({
+            "thought": thought,
+            "nextThoughtNeeded": nextThoughtNeeded,
+            "thoughtNumber": thoughtNumber,
+            "totalThoughts": totalThoughts,
+            "isRevision": isRevision,
+            "revisesThought": revisesThought,
+            "branchFromThought": branchFromThought,
+            "branchId": branchId,
+            "needsMoreThoughts": needsMoreThoughts
+        })
         
         # Process the thought
         _process_thought(thought_data)
         
         # Update session timestamp
-        global session
-        session.updated_at = datetime.now().isoformat()
+        session.updated_at = time.time()
         
         return f"✅ Processed thought {thought_data.thought_number}/{thought_data.total_thoughts}"
         
@@ -242,41 +260,66 @@ def think(
         return f"❌ {error_msg}"
 
 
+def _dump(data: object) -> str:
+    """Encode resource data as indented JSON."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
+@lru_cache(maxsize=1)
+def _history_json(session_id: str, version: int) -> str:
+    """Serialize the main thought history for the given session and version."""
+    return _dump([thought.to_display_dict() for thought in session.main_thoughts])
+
+
+@lru_cache(maxsize=1)
+def _summary_json(session_id: str, version: int) -> str:
+    """Serialize the session summary for the given session and version."""
+    return session.get_summary().model_dump_json(indent=2)
+
+
+@lru_cache(maxsize=1)
+def _branches_json(session_id: str, version: int) -> str:
+    """Serialize the branch overview for the given session and version."""
+    branches_info = [
+        {
+            "branch_id": branch_id,
+            "branch_from_thought": thoughts[0].branch_from_thought or 0,
+            "thoughts": [thought.model_dump() for thought in thoughts],
+        }
+        for branch_id, thoughts in session.branches.items()
+    ]
+    
+    return _dump(branches_info)
+
+
+@lru_cache(maxsize=1)
+def _session_json(session_id: str, version: int, updated_at: Optional[float]) -> str:
+    """Serialize the complete session for the given session, version and update time."""
+    return session.model_dump_json(indent=2)
+
+
 @mcp.resource("thoughts://history")
 def get_thought_history() -> str:
     """Complete history of all thoughts in the main branch."""
-    return json.dumps(
-        [thought.to_display_dict() for thought in session.main_thoughts],
-        indent=2
-    )
+    return _history_json(session.session_id, session.version)
 
 
 @mcp.resource("thoughts://summary")
 def get_thinking_summary() -> str:
     """Summary of the entire thinking process."""
-    summary = session.get_summary()
-    return json.dumps(summary.dict(), indent=2)
+    return _summary_json(session.session_id, session.version)
 
 
 @mcp.resource("thoughts://branches")
 def get_branch_overview() -> str:
     """Overview of all branches in the thinking process."""
-    branches_info = []
-    for branch_id, thoughts in session.branches.items():
-        branch_info = BranchInfo(
-            branch_id=branch_id,
-            branch_from_thought=thoughts[0].branch_from_thought or 0,
-            thoughts=thoughts
-        )
-        branches_info.append(branch_info.dict())
-    
-    return json.dumps(branches_info, indent=2)
+    return _branches_json(session.session_id, session.version)
 
 
 @mcp.resource("thoughts://session")
 def get_complete_session() -> str:
     """Complete thinking session with all thoughts and branches."""
-    return json.dumps(session.dict(), indent=2)
+    return _session_json(session.session_id, session.version, session.updated_at)
 
 
 # Log startup when module is imported
@@ -13,8 +13,8 @@ import asyncio
 import json
 import os
 import sys
+import time
 import uuid
-from datetime import datetime
 from typing import Any, Dict, List, Optional, Sequence
 
 from mcp import ClientSession, ServerSession
@@ -57,10 +57,11 @@ class SequentialThinkingServer:
         )
         
         # Initialize thinking session
+        now = time.time()
         self.session = ThinkingSession(
             session_id=str(uuid.uuid4()),
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat()
+            created_at=now,
+            updated_at=now
         )
         
         # Create the MCP server
@@ -253,7 +254,7 @@ class SequentialThinkingServer:
                 await self._process_thought(thought_data)
                 
                 # Update session timestamp
-                self.session.updated_at = datetime.now().isoformat()
+                self.session.updated_at = time.time()
                 
                 # Return success response
                 return CallToolResult(
@@ -298,10 +299,7 @@ class SequentialThinkingServer:
         # Determine if this is a branch or main thought
         if thought_data.branch_id and thought_data.branch_from_thought:
             # This is a branch thought
-            if thought_data.branch_id not in self.session.branches:
-                self.session.branches[thought_data.branch_id] = []
-            
-            self.session.branches[thought_data.branch_id].append(thought_data)
+            self.session.add_thought(thought_data, branch_id=thought_data.branch_id)
             
             if not self.disable_thought_logging:
                 self._log_branch_thought(thought_data)
@@ -312,7 +310,7 @@ class SequentialThinkingServer:
                 self._handle_revision(thought_data)
             else:
                 # Regular thought
-                self.session.main_thoughts.append(thought_data)
+                self.session.add_thought(thought_data)
             
             if not self.disable_thought_logging:
                 self._log_main_thought(thought_data)
@@ -320,15 +318,12 @@ class SequentialThinkingServer:
     def _handle_revision(self, thought_data: ThoughtData) -> None:
         """Handle a revision of a previous thought."""
         if thought_data.revises_thought and thought_data.revises_thought <= len(self.session.main_thoughts):
-            # Replace the thought being revised
-            revision_index = thought_data.revises_thought - 1
-            self.session.main_thoughts[revision_index] = thought_data
-            
-            # Remove any subsequent thoughts that are now invalidated
-            self.session.main_thoughts = self.session.main_thoughts[:revision_index + 1]
+            # Replace the thought being revised and remove any subsequent
+            # thoughts that are now invalidated
+            self.session.revise_thought(thought_data.revises_thought - 1, thought_data)
         else:
             # If revision target is invalid, treat as regular thought
-            self.session.main_thoughts.append(thought_data)
+            self.session.add_thought(thought_data)
     
     def _log_startup(self) -> None:
         """Log server startup message."""
@@ -5,12 +5,22 @@ This module contains tests for the core functionality of the server,
 including thought processing, validation, and resource handling.
 """
 
+import base64
 import pytest
 from unittest.mock import patch, MagicMock
 import json
 import os
+import uuid
 from typing import Dict, Any
 
+from mcp.types import (
+    ListResourcesRequest,
+    ListToolsRequest,
+    ReadResourceRequest,
+    ReadResourceRequestParams,
+)
+
+from sequential_thinking_mcp import server_fastmcp
 from sequential_thinking_mcp.server import SequentialThinkingServer
 from sequential_thinking_mcp.models import ThoughtData, ThinkingSession
 
@@ -24,6 +34,14 @@ class TestSequentialThinkingServer:
         with patch.dict(os.environ, {"DISABLE_THOUGHT_LOGGING": "true"}):
             self.server = SequentialThinkingServer()
 
+    async def _read_resource(self, uri):
+        """Read a resource through the registered MCP request handler."""
+        handler = self.server.server.request_handlers[ReadResourceRequest]
+        request = ReadResourceRequest(
+            method="resources/read", params=ReadResourceRequestParams(uri=uri)
+        )
+        return (await handler(request)).root
+
     def test_server_initialization(self):
         """Test that the server initializes properly."""
         assert self.server is not None
@@ -49,6 +67,29 @@ class TestSequentialThinkingServer:
             server = SequentialThinkingServer()
             assert server.disable_thought_logging is False
 
+    def test_pretty_json_environment_variable(self):
+        """Test that MCP_PRETTY_JSON toggles indented resource output."""
+        assert self.server.pretty_json is False
+
+        with patch.dict(os.environ, {"DISABLE_THOUGHT_LOGGING": "true", "MCP_PRETTY_JSON": "true"}):
+            server = SequentialThinkingServer()
+            assert server.pretty_json is True
+
+        thought = ThoughtData(
+            thought="Formatting check",
+            thoughtNumber=1,
+            totalThoughts=1,
+            nextThoughtNeeded=False
+        )
+        for target in (self.server, server):
+            target.session.add_thought(thought)
+
+        compact = self.server._res_history()[0].content
+        pretty = server._res_history()[0].content
+        assert "\n" not in compact
+        assert "\n  " in pretty
+        assert json.loads(compact) == json.loads(pretty)
+
     @pytest.mark.asyncio
     async def test_basic_thought_processing(self):
         """Test basic thought processing without revisions or branches."""
@@ -232,7 +273,7 @@ class TestSequentialThinkingServer:
             totalThoughts=2,
             nextThoughtNeeded=True
         )
-        self.server.session.main_thoughts.append(thought1)
+        self.server.session.add_thought(thought1)
 
         thought2 = ThoughtData(
             thought="Second thought",
@@ -240,7 +281,7 @@ class TestSequentialThinkingServer:
             totalThoughts=2,
             nextThoughtNeeded=False  # Complete
         )
-        self.server.session.main_thoughts.append(thought2)
+        self.server.session.add_thought(thought2)
 
         # Add a branch
         branch_thought = ThoughtData(
@@ -251,7 +292,7 @@ class TestSequentialThinkingServer:
             branchFromThought=1,
             branchId="test_branch"
         )
-        self.server.session.branches["test_branch"] = [branch_thought]
+        self.server.session.add_thought(branch_thought, branch_id="test_branch")
 
         # Test updated summary
         summary = self.server.session.get_summary()
@@ -261,6 +302,38 @@ class TestSequentialThinkingServer:
         assert "test_branch" in summary.branches
         assert summary.is_complete is True  # Last main thought has nextThoughtNeeded=False
 
+    @pytest.mark.asyncio
+    async def test_session_summary_after_revision(self):
+        """Test that summary counters track thoughts dropped by a revision."""
+        for number in (1, 2, 3):
+            await self.server._process_thought(ThoughtData(
+                thought=f"Thought {number}",
+                thoughtNumber=number,
+                totalThoughts=3,
+                nextThoughtNeeded=True
+            ))
+
+        summary = self.server.session.get_summary()
+        assert summary.total_thoughts == 3
+        assert self.server.session.get_summary() is summary  # Cached until changed
+
+        # Revise the second thought, dropping the third
+        await self.server._process_thought(ThoughtData(
+            thought="Revised second thought",
+            thoughtNumber=2,
+            totalThoughts=2,
+            nextThoughtNeeded=False,
+            isRevision=True,
+            revisesThought=2
+        ))
+
+        summary = self.server.session.get_summary()
+        assert summary.total_thoughts == 2
+        assert summary.main_branch_thoughts == 2
+        assert summary.revisions_count == 1
+        assert summary.is_complete is True
+        assert summary.last_thought.thought == "Revised second thought"
+
     def test_to_display_dict(self):
         """Test ThoughtData to_display_dict method."""
         thought = ThoughtData(
@@ -289,6 +362,83 @@ class TestSequentialThinkingServer:
         assert display_dict["isRevision"] is True
         assert display_dict["revisesThought"] == 1
 
+    def test_session_summary_seeds_counters_from_constructor(self):
+        """Test that thoughts passed at construction are counted in the summary."""
+        branch_thought = ThoughtData(
+            thought="Branch thought",
+            thoughtNumber=2,
+            totalThoughts=2,
+            nextThoughtNeeded=False,
+            branchFromThought=1,
+            branchId="alt"
+        )
+        session = ThinkingSession(session_id="seeded", branches={"alt": [branch_thought]})
+
+        assert session.get_summary().total_thoughts == 1
+
+        session.add_thought(branch_thought, branch_id="alt")
+        assert session.get_summary().total_thoughts == 2
+
+    def test_session_timestamps_serialize_as_iso(self):
+        """Test that epoch timestamps are dumped as ISO strings and parsed back."""
+        session = ThinkingSession(session_id="ts", created_at=0.0, updated_at=1.5)
+
+        dumped = session.model_dump()
+        assert isinstance(dumped["created_at"], str)
+        assert isinstance(json.loads(session.model_dump_json())["updated_at"], str)
+
+        restored = ThinkingSession.model_validate(dumped)
+        assert restored.created_at == 0.0
+        assert restored.updated_at == 1.5
+
+        # Assignments are not validated, so an ISO string must still serialize
+        session.updated_at = "2025-01-01T00:00:00"
+        assert session.model_dump()["updated_at"] == "2025-01-01T00:00:00"
+
+    @pytest.mark.asyncio
+    async def test_session_resource_is_single_document(self):
+        """Test that thoughts://session returns the whole session as one JSON content."""
+        thought = ThoughtData(
+            thought="thought 💭 révision " * 500,
+            thoughtNumber=1,
+            totalThoughts=1,
+            nextThoughtNeeded=False
+        )
+        await self.server._process_thought(thought)
+
+        result = self.server._res_session()
+
+        assert len(result) == 1
+        session_data = json.loads(result[0].content)
+        assert session_data["session_id"] == self.server.session.session_id
+        assert session_data["main_thoughts"][0]["thought"] == thought.thought
+
+    @pytest.mark.asyncio
+    async def test_msgpack_resources(self):
+        """Test that msgpack resources read over MCP decode to the same data as the JSON ones."""
+        msgpack = pytest.importorskip("msgpack")
+
+        thought = ThoughtData(
+            thought="Packed thought",
+            thoughtNumber=1,
+            totalThoughts=1,
+            nextThoughtNeeded=False
+        )
+        await self.server._process_thought(thought)
+
+        history_result = await self._read_resource("thoughts://history.msgpack")
+        assert history_result.contents[0].mimeType == "application/msgpack"
+        history = msgpack.unpackb(base64.b64decode(history_result.contents[0].blob))
+        assert history == json.loads(self.server._res_history()[0].content)
+        assert history[0]["thoughtNumber"] == 1
+
+        session_result = await self._read_resource("thoughts://session.msgpack")
+        session_data = msgpack.unpackb(base64.b64decode(session_result.contents[0].blob))
+        assert session_data == json.loads(self.server._res_session()[0].content)
+        assert set(session_data) == {
+            "session_id", "main_thoughts", "branches", "created_at", "updated_at"
+        }
+
     @pytest.mark.asyncio
     async def test_tool_call_integration(self):
         """Test the full tool call integration."""
@@ -296,15 +446,21 @@ class TestSequentialThinkingServer:
         server = self.server.server
         
         # Test list_tools
-        tools_result = await server._request_handlers["tools/list"]()
+        tools_result = (
+            await server.request_handlers[ListToolsRequest](ListToolsRequest(method="tools/list"))
+        ).root
         assert len(tools_result.tools) == 1
         assert tools_result.tools[0].name == "think"
 
         # Test resources
-        resources_result = await server._request_handlers["resources/list"]()
+        resources_result = (
+            await server.request_handlers[ListResourcesRequest](
+                ListResourcesRequest(method="resources/list")
+            )
+        ).root
         assert len(resources_result.resources) >= 4
         
-        resource_uris = [r.uri for r in resources_result.resources]
+        resource_uris = [str(r.uri) for r in resources_result.resources]
         assert "thoughts://history" in resource_uris
         assert "thoughts://summary" in resource_uris
         assert "thoughts://branches" in resource_uris
@@ -323,19 +479,136 @@ class TestSequentialThinkingServer:
         await self.server._process_thought(thought)
 
         # Test reading history resource
-        history_result = await self.server.server._request_handlers["resources/read"]("thoughts://history")
+        history_result = await self._read_resource("thoughts://history")
         assert len(history_result.contents) == 1
         history_data = json.loads(history_result.contents[0].text)
         assert len(history_data) == 1
         assert history_data[0]["thought"] == "Test thought for resource"
 
         # Test reading summary resource
-        summary_result = await self.server.server._request_handlers["resources/read"]("thoughts://summary")
+        summary_result = await self._read_resource("thoughts://summary")
         assert len(summary_result.contents) == 1
         summary_data = json.loads(summary_result.contents[0].text)
         assert summary_data["total_thoughts"] == 1
         assert summary_data["is_complete"] is True
 
 
+class TestFastMCPServer:
+    """Test suite for the FastMCP server module."""
+
+    def setup_method(self):
+        """Give each test a fresh module-level session."""
+        server_fastmcp.disable_thought_logging = True
+        server_fastmcp.session = ThinkingSession(session_id=str(uuid.uuid4()))
+
+    def test_resources_follow_a_rebound_session(self):
+        """Test that cached resource JSON is not reused across sessions."""
+        thought = ThoughtData(
+            thought="Old session", thoughtNumber=1, totalThoughts=1, nextThoughtNeeded=False
+        )
+        server_fastmcp._process_thought(thought)
+        assert len(json.loads(server_fastmcp.get_thought_history())) == 1
+        assert json.loads(server_fastmcp.get_thinking_summary())["is_complete"] is True
+        server_fastmcp.get_complete_session()
+
+        fresh = ThinkingSession(session_id=str(uuid.uuid4()))
+        server_fastmcp.session = fresh
+        server_fastmcp._process_thought(
+            ThoughtData(thought="New session", thoughtNumber=1, totalThoughts=2, nextThoughtNeeded=True)
+        )
+
+        # Both sessions are now at version 1, so only the session id tells them apart
+        assert fresh.version == 1
+        assert json.loads(server_fastmcp.get_thought_history())[0]["thought"] == "New session"
+        assert json.loads(server_fastmcp.get_thinking_summary())["is_complete"] is False
+        assert json.loads(server_fastmcp.get_complete_session())["session_id"] == fresh.session_id
+
+    @pytest.mark.asyncio
+    async def test_resources_match_low_level_server(self):
+        """Test that both servers return the same keys for each resource."""
+        with patch.dict(os.environ, {"DISABLE_THOUGHT_LOGGING": "true"}):
+            server = SequentialThinkingServer()
+
+        thoughts = [
+            ThoughtData(thought="Main", thoughtNumber=1, totalThoughts=2, nextThoughtNeeded=True),
+            ThoughtData(
+                thought="Branch",
+                thoughtNumber=2,
+                totalThoughts=2,
+                nextThoughtNeeded=False,
+                branchFromThought=1,
+                branchId="alt"
+            ),
+        ]
+        for thought in thoughts:
+            await server._process_thought(thought)
+            server_fastmcp._process_thought(thought)
+
+        def keys(value):
+            if isinstance(value, dict):
+                return {key: keys(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [keys(item) for item in value]
+            return None
+
+        pairs = [
+            (server._res_history, server_fastmcp.get_thought_history),
+            (server._res_summary, server_fastmcp.get_thinking_summary),
+            (server._res_branches, server_fastmcp.get_branch_overview),
+            (server._res_session, server_fastmcp.get_complete_session),
+        ]
+        for low_level, fastmcp in pairs:
+            expected = json.loads(low_level()[0].content)
+            assert keys(json.loads(fastmcp())) == keys(expected)
+
+        summary = json.loads(server._res_summary()[0].content)
+        assert "thought_number" in summary["last_thought"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "arguments, message",
+        [
+            (
+                {"thoughtNumber": 5, "totalThoughts": 3},
+                "thoughtNumber must be between 1 and totalThoughts",
+            ),
+            (
+                {"thoughtNumber": 1, "totalThoughts": 3, "isRevision": True},
+                "revisesThought must be set when isRevision is True",
+            ),
+            (
+                {"thoughtNumber": 1, "totalThoughts": 3, "branchId": "alt"},
+                "branchId requires branchFromThought to be set",
+            ),
+        ],
+    )
+    async def test_think_rejects_malformed_arguments(self, arguments, message):
+        """Test that think() rejects malformed arguments without touching the session."""
+        version = server_fastmcp.session.version
+
+        result = await server_fastmcp.think(
+            thought="Rejected", nextThoughtNeeded=True, **arguments
+        )
+
+        assert result == f"❌ Invalid thought data: {message}"
+        assert server_fastmcp.session.version == version
+        assert server_fastmcp.session.main_thoughts == []
+
+    def test_log_main_thought_with_default_flags(self, capsys):
+        """Test that a thought with needsMoreThoughts left unset logs its status line."""
+        server_fastmcp.disable_thought_logging = False
+        thought = ThoughtData(
+            thought="Unflagged",
+            thoughtNumber=1,
+            totalThoughts=1,
+            nextThoughtNeeded=False
+        )
+        assert thought.needs_more_thoughts is None
+
+        server_fastmcp._log_main_thought(thought)
+
+        assert "Thinking complete" in capsys.readouterr().err
+
+
 if __name__ == "__main__":
     pytest.main([__file__])